@@ -8,7 +8,9 @@ import pyarrow
 import ray
 from jsonargparse import Namespace
 from loguru import logger
+from ray.data._internal.datasource.json_datasink import JSONDatasink
 from ray.data._internal.util import get_compute_strategy
+from ray.data.block import BlockAccessor
 
 from data_juicer.core.data import DJDataset
 from data_juicer.core.data.schema import Schema
@@ -367,6 +369,33 @@ class JSONStreamDatasource(ray.data.read_api.ArrowJSONDatasource):
             raise ValueError(f"Failed to read JSON file: {path}.") from e
 
 
+class ORJSONDatasink(JSONDatasink):
+    """
+    A Datasink for writing json lines with `orjson`, which is much faster than
+    the pandas-based writer and keeps non-ASCII characters as they are.
+
+    Note:
+
+        Blocks that `orjson` can't serialize as pandas does (e.g. bytes or
+        datetimes) fall back to the pandas-based writer.
+        Unlike pandas `to_json` (`double_precision=10`), floats are written
+        with their shortest round-trip representation, e.g.
+        `0.30000000000000004` is no longer rounded to `0.3`.
+    """
+
+    def write_block_to_file(self, block: BlockAccessor, file: "pyarrow.NativeFile"):
+        import orjson
+
+        option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        try:
+            # serialize the whole block before writing, so that the fallback
+            # starts with an empty file
+            lines = [orjson.dumps(row, option=option) for row in block.to_arrow().to_pylist()]
+        except TypeError:
+            return super().write_block_to_file(block, file)
+        file.write(b"".join(lines))
+
+
 def read_json_stream(
     paths: Union[str, List[str]],
     *,
@@ -1,14 +1,32 @@
-import copy
-import os
+import importlib.util
+import re
 from functools import partial
 
+import pyarrow.fs
 from loguru import logger
 
 from data_juicer.utils.constant import Fields, HashKeys
 from data_juicer.utils.file_utils import Sizes, byte_size_to_size_str
 from data_juicer.utils.model_utils import filter_arguments
 from data_juicer.utils.s3_utils import create_filesystem_from_args
-from data_juicer.utils.webdataset_utils import reconstruct_custom_webdataset_format
+from data_juicer.utils.webdataset_utils import (
+    reconstruct_custom_webdataset_format_batch,
+)
+
+# the suffix of a local path or an URI, ignoring any query string or fragment
+_SUFFIX_RE = re.compile(r"\.([A-Za-z0-9]+)(?:[?#].*)?$")
+
+# fields dropped from the exported dataset unless they are asked to be kept
+_STATS_FIELDS = frozenset({Fields.stats, Fields.meta})
+_HASH_FIELDS = frozenset(
+    {
+        HashKeys.hash,
+        HashKeys.minhash,
+        HashKeys.simhash,
+        HashKeys.imagehash,
+        HashKeys.videohash,
+    }
+)
 
 
 class RayExporter:
@@ -29,6 +47,26 @@ class RayExporter:
         # 'numpy',
     }
 
+    # arguments of `Dataset.write_json` that the orjson-based writer supports
+    _ORJSON_WRITE_ARGS = {
+        "filesystem",
+        "try_create_dir",
+        "arrow_open_stream_args",
+        "filename_provider",
+        "min_rows_per_file",
+        "mode",
+        "ray_remote_args",
+        "concurrency",
+    }
+
+    # formats whose blocks can be serialized independently of each other
+    _STATELESS_FORMATS = {
+        "json",
+        "jsonl",
+        "csv",
+        "tfrecords",
+    }
+
     def __init__(
         self,
         export_path,
@@ -68,10 +106,31 @@ class RayExporter:
             )
         self.export_extra_args = kwargs if kwargs is not None else {}
 
-        fs_args = copy.deepcopy(self.export_extra_args)
+        # create_filesystem_from_args only pops top-level keys, so a shallow
+        # copy is enough to leave export_extra_args untouched
+        fs_args = dict(self.export_extra_args)
         self.fs = create_filesystem_from_args(export_path, fs_args)
         self._check_shard_size()
 
+        # resolve the parts of an export that don't depend on the dataset
+        # once, so that repeated exports only need to copy them
+        self._export_method = self._ROUTER.get(self.export_format, RayExporter.write_others)
+
+        self._removed_field_candidates = frozenset()
+        if not self.keep_stats_in_res_ds:
+            self._removed_field_candidates |= _STATS_FIELDS
+        if not self.keep_hashes_in_res_ds:
+            self._removed_field_candidates |= _HASH_FIELDS
+
+        self._base_export_extra_args = dict(self.export_extra_args)
+        # Add filesystem if available
+        if self.fs is not None:
+            self._base_export_extra_args["filesystem"] = self.fs
+            # object stores have no real directories, so skip the extra
+            # round-trip that creates the directory marker before writing
+            if isinstance(self.fs, pyarrow.fs.S3FileSystem):
+                self._base_export_extra_args.setdefault("try_create_dir", False)
+
     def _check_shard_size(self):
         if self.export_shard_size == 0:
             return
@@ -104,7 +163,8 @@ class RayExporter:
         :param export_path: the path to export datasets.
         :return: the export data format.
         """
-        suffix = os.path.splitext(export_path)[-1].strip(".")
+        match = _SUFFIX_RE.search(export_path)
+        suffix = match.group(1).lower() if match else ""
         if not suffix:
             logger.warning(
                 f'export_path "{export_path}" does not have a suffix. '
@@ -115,6 +175,31 @@ class RayExporter:
         export_format = suffix
         return export_format
 
+    @staticmethod
+    def _repartition_for_write(dataset):
+        """
+        Repartition a materialized dataset that has fewer blocks than the
+        available CPUs, so that each CPU gets a block to serialize.
+
+        Lazy datasets are left untouched, so this does not take effect for
+        `RayExecutor.run`, which exports the processed dataset lazily.
+
+        :param dataset: the dataset to repartition.
+        :return: the repartitioned dataset.
+        """
+        import ray
+
+        try:
+            num_blocks = dataset.num_blocks()
+        except NotImplementedError:
+            # the number of blocks of a lazy dataset is decided at execution
+            return dataset
+        num_cpus = int(ray.cluster_resources().get("CPU", 1))
+        target_num_blocks = min(dataset.count(), num_cpus)
+        if num_blocks < target_num_blocks:
+            dataset = dataset.repartition(target_num_blocks)
+        return dataset
+
     def _export_impl(self, dataset, export_path, columns=None):
         """
         Export a dataset to specific path.
@@ -124,37 +209,30 @@ class RayExporter:
         :param columns: the columns to export.
         :return:
         """
-        feature_fields = dataset.columns() if not columns else columns
-        removed_fields = []
-        if not self.keep_stats_in_res_ds:
-            extra_fields = {Fields.stats, Fields.meta}
-            removed_fields.extend(list(extra_fields.intersection(feature_fields)))
-        if not self.keep_hashes_in_res_ds:
-            extra_fields = {
-                HashKeys.hash,
-                HashKeys.minhash,
-                HashKeys.simhash,
-                HashKeys.imagehash,
-                HashKeys.videohash,
-            }
-            removed_fields.extend(list(extra_fields.intersection(feature_fields)))
-
-        if len(removed_fields):
-            dataset = dataset.drop_columns(removed_fields)
-
-        router = self._router()
-        if self.export_format in router:
-            export_method = router[self.export_format]
-        else:
-            export_method = RayExporter.write_others
-
+        if self.export_format in self._STATELESS_FORMATS:
+            dataset = self._repartition_for_write(dataset)
+
+        if self._removed_field_candidates:
+            feature_fields = dataset.columns() if not columns else columns
+            removed_fields = list(self._removed_field_candidates.intersection(feature_fields))
+
+            if len(removed_fields):
+                if columns:
+                    # the given columns might not cover the columns added during
+                    # processing, so only drop the known ones
+                    dataset = dataset.drop_columns(removed_fields)
+                else:
+                    # the full schema is known here, so express the drop as a
+                    # projection that Ray Data can fuse and push down
+                    dataset = dataset.select_columns([col for col in feature_fields if col not in removed_fields])
+
+        # build a fresh dict per call so that exports don't mutate the shared
+        # export args
+        export_extra_args = dict(self._base_export_extra_args)
         export_kwargs = {
-            "export_extra_args": self.export_extra_args,
+            "export_extra_args": export_extra_args,
             "export_format": self.export_format,
         }
-        # Add filesystem if available
-        if self.fs is not None:
-            export_kwargs["export_extra_args"]["filesystem"] = self.fs
 
         if self.export_shard_size > 0:
             dataset_nbytes = dataset.size_bytes()
@@ -164,9 +242,9 @@ class RayExporter:
                 num_shards = int(dataset_nbytes / self.export_shard_size) + 1
                 num_shards = min(num_shards, dataset_num_rows)
                 rows_per_file = max(1, int(dataset_num_rows / num_shards))
-                export_kwargs["export_extra_args"]["min_rows_per_file"] = rows_per_file
+                export_extra_args["min_rows_per_file"] = rows_per_file
 
-        return export_method(dataset, export_path, **export_kwargs)
+        return self._export_method(dataset, export_path, **export_kwargs)
 
     def export(self, dataset, columns=None):
         """
@@ -181,7 +259,9 @@ class RayExporter:
     @staticmethod
     def write_json(dataset, export_path, **kwargs):
         """
-        Export method for json/jsonl target files.
+        Export method for json/jsonl target files. If `orjson` is installed
+        and no pandas-specific arguments are given, the faster orjson-based
+        writer is used.
 
         :param dataset: the dataset to export.
         :param export_path: the path to store the exported dataset.
@@ -193,8 +273,39 @@ class RayExporter:
         # Add S3 filesystem if available
         if "filesystem" in export_extra_args:
             filtered_kwargs["filesystem"] = export_extra_args["filesystem"]
+        if importlib.util.find_spec("orjson") is not None and RayExporter._ORJSON_WRITE_ARGS.issuperset(
+            filtered_kwargs
+        ):
+            return RayExporter._write_json_with_orjson(dataset, export_path, **filtered_kwargs)
         return dataset.write_json(export_path, force_ascii=False, **filtered_kwargs)
 
+    @staticmethod
+    def _write_json_with_orjson(
+        dataset, export_path, arrow_open_stream_args=None, ray_remote_args=None, concurrency=None, **kwargs
+    ):
+        """
+        Export method for json/jsonl target files based on `orjson`.
+
+        :param dataset: the dataset to export.
+        :param export_path: the path to store the exported dataset.
+        :param arrow_open_stream_args: arguments to open the output streams.
+        :param ray_remote_args: extra remote args of the write tasks.
+        :param concurrency: the maximum number of concurrent write tasks.
+        :param kwargs: extra arguments of the datasink.
+        :return:
+        """
+        from data_juicer.core.data.ray_dataset import ORJSONDatasink
+
+        datasink = ORJSONDatasink(
+            export_path,
+            open_stream_args=arrow_open_stream_args,
+            # keep non-ASCII text as is in blocks that fall back to pandas
+            pandas_json_args={"force_ascii": False},
+            dataset_uuid=getattr(dataset, "_uuid", None),
+            **kwargs,
+        )
+        return dataset.write_datasink(datasink, ray_remote_args=ray_remote_args, concurrency=concurrency)
+
     @staticmethod
     def write_webdataset(dataset, export_path, **kwargs):
         """
@@ -211,8 +322,8 @@ class RayExporter:
         export_extra_args = kwargs.get("export_extra_args", {})
         field_mapping = export_extra_args.get("field_mapping", {})
         if len(field_mapping) > 0:
-            reconstruct_func = partial(reconstruct_custom_webdataset_format, field_mapping=field_mapping)
-            dataset = dataset.map(reconstruct_func)
+            reconstruct_func = partial(reconstruct_custom_webdataset_format_batch, field_mapping=field_mapping)
+            dataset = dataset.map_batches(reconstruct_func, batch_format="pyarrow", zero_copy_batch=True)
         filtered_kwargs = filter_arguments(dataset.write_webdataset, export_extra_args)
         # Add S3 filesystem if available
         if "filesystem" in export_extra_args:
@@ -246,47 +357,60 @@ class RayExporter:
     def write_iceberg(dataset, export_path, **kwargs):
         """
         Export method for iceberg target tables.
-        Checks for table existence/connectivity. If check fails, safe fall-back to JSON.
-        """
-        from pyiceberg.catalog import load_catalog
-        from pyiceberg.exceptions import NoSuchTableError
+        If writing to Iceberg fails, safe fall-back to file export.
 
+        :param dataset: the dataset to export.
+        :param export_path: the path to store the exported dataset when
+            falling back to file export.
+        :param kwargs: extra arguments. Set `verify_table` in
+            `export_extra_args` to check the existence of the target table
+            before writing, which costs an extra catalog round-trip.
+        :return:
+        """
         export_extra_args = kwargs.get("export_extra_args", {})
-        catalog_kwargs = export_extra_args.get("catalog_kwargs", {})
         table_identifier = export_extra_args.get("table_identifier", export_path)
 
-        use_iceberg = False
+        use_iceberg = True
 
-        try:
-            catalog = load_catalog(**catalog_kwargs)
-            catalog.load_table(table_identifier)
-            logger.info(f"Iceberg table {table_identifier} exists. Writing to Iceberg.")
-            use_iceberg = True
+        if export_extra_args.get("verify_table", False):
+            from pyiceberg.catalog import load_catalog
+            from pyiceberg.exceptions import NoSuchTableError
 
-        except NoSuchTableError as e:
-            logger.warning(
-                f"Iceberg target unavailable ({e.__class__.__name__}). Fallback to exporting to {export_path}..."
-            )
-        except Exception as e:
-            logger.error(f"Unexpected error checking Iceberg: {e}. Fallback to exporting to {export_path}...")
+            catalog_kwargs = export_extra_args.get("catalog_kwargs", {})
+            try:
+                catalog = load_catalog(**catalog_kwargs)
+                catalog.load_table(table_identifier)
+                logger.info(f"Iceberg table {table_identifier} exists. Writing to Iceberg.")
+            except NoSuchTableError as e:
+                logger.warning(
+                    f"Iceberg target unavailable ({e.__class__.__name__}). Fallback to exporting to {export_path}..."
+                )
+                use_iceberg = False
+            except Exception as e:
+                logger.error(f"Unexpected error checking Iceberg: {e}. Fallback to exporting to {export_path}...")
+                use_iceberg = False
 
         if use_iceberg:
+            # a missing table or an unreachable catalog surfaces as a write
+            # failure, so there is no need to check them in advance
             try:
                 filtered_kwargs = filter_arguments(dataset.write_iceberg, export_extra_args)
                 return dataset.write_iceberg(table_identifier, **filtered_kwargs)
             except Exception as e:
-                logger.error(f"Write to Iceberg failed during execution: {e}. Fallback to json...")
+                logger.error(f"Write to Iceberg failed during execution: {e}. Fallback to file export...")
 
-        suffix = os.path.splitext(export_path)[-1].strip(".").lower()
+        match = _SUFFIX_RE.search(export_path)
+        suffix = match.group(1).lower() if match else ""
         if not suffix:
             suffix = "jsonl"
             logger.warning(f"No suffix found in {export_path}, using default fallback: {suffix}")
 
         logger.info(f"Falling back to file export. Format: [{suffix}], Path: [{export_path}]")
 
-        fallback_kwargs = {}
+        fallback_extra_args = {}
         if "filesystem" in export_extra_args:
-            fallback_kwargs["filesystem"] = export_extra_args["filesystem"]
+            fallback_extra_args["filesystem"] = export_extra_args["filesystem"]
+        fallback_kwargs = {"export_extra_args": fallback_extra_args}
         if suffix in ["json", "jsonl"]:
             return RayExporter.write_json(dataset, export_path, **fallback_kwargs)
         else:
@@ -294,16 +418,9 @@ class RayExporter:
             return RayExporter.write_others(dataset, export_path, **fallback_kwargs)
 
     # suffix to export method
-    @staticmethod
-    def _router():
-        """
-        A router from different suffixes to corresponding export methods.
-
-        :return: A dict router.
-        """
-        return {
-            "jsonl": RayExporter.write_json,
-            "json": RayExporter.write_json,
-            "webdataset": RayExporter.write_webdataset,
-            "iceberg": RayExporter.write_iceberg,
-        }
+    _ROUTER = {
+        "jsonl": write_json,
+        "json": write_json,
+        "webdataset": write_webdataset,
+        "iceberg": write_iceberg,
+    }
@@ -6,7 +6,7 @@ import os
 import subprocess
 import sys
 from contextlib import redirect_stderr
-from functools import partial
+from functools import lru_cache, partial
 from pickle import UnpicklingError
 from typing import List, Optional, Union
 
@@ -158,6 +158,11 @@ def check_model_home(model_name):
     return model_name
 
 
+@lru_cache(maxsize=128)
+def _get_signature_parameters(func):
+    return inspect.signature(func).parameters
+
+
 def filter_arguments(func, args_dict):
     """
     Filters and returns only the valid arguments for a given function
@@ -168,7 +173,14 @@ def filter_arguments(func, args_dict):
     :return: A dictionary containing only the arguments that match the
                 function's signature, preserving any **kwargs if applicable.
     """
-    params = inspect.signature(func).parameters
+    # cache by the underlying function, since bound methods are created anew
+    # on every attribute access
+    func = getattr(func, "__func__", func)
+    try:
+        params = _get_signature_parameters(func)
+    except TypeError:
+        # unhashable callables
+        params = inspect.signature(func).parameters
     filtered_args = {}
     for name, param in params.items():
         if param.kind == inspect.Parameter.VAR_KEYWORD:
@@ -247,3 +247,38 @@ def reconstruct_custom_webdataset_format(samples, field_mapping: Optional[Dict[s
             reconstructed_sample[tgt_field] = {src_field_item: samples[src_field_item] for src_field_item in src_field}
 
     return reconstructed_sample
+
+
+def reconstruct_custom_webdataset_format_batch(table, field_mapping: Optional[Dict[str, str]] = None):
+    """
+    Reconstruct a batch of the original dataset to the WebDataset format.
+    It's the columnar version of `reconstruct_custom_webdataset_format`,
+    which only rearranges the columns of the pyarrow table without copying
+    the underlying data.
+
+    :param table: the input pyarrow table to be reconstructed
+    :param field_mapping: the field mapping to construct the left fields.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if field_mapping is None:
+        field_mapping = {}
+    assert isinstance(field_mapping, dict)
+
+    # not specified -- return the original table
+    if len(field_mapping) == 0:
+        return table
+
+    # construct the left fields
+    reconstructed_columns = {}
+    for tgt_field, src_field in field_mapping.items():
+        assert isinstance(src_field, str) or isinstance(src_field, list)
+        if isinstance(src_field, str):
+            reconstructed_columns[tgt_field] = table.column(src_field)
+        elif isinstance(src_field, list):
+            reconstructed_columns[tgt_field] = pc.make_struct(
+                *[table.column(src_field_item) for src_field_item in src_field], field_names=src_field
+            )
+
+    return pa.table(reconstructed_columns)
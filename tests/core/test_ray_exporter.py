@@ -1,8 +1,10 @@
 import copy
+import importlib.util
 import os
 import os.path as osp
 import shutil
 import unittest
+from unittest.mock import patch
 
 from data_juicer.utils.unittest_utils import TEST_TAG, DataJuicerTestCaseBase
 from data_juicer.core.ray_exporter import RayExporter
@@ -47,6 +49,34 @@ class TestRayExporter(DataJuicerTestCaseBase):
 
         return res
 
+    @TEST_TAG('ray')
+    def test_get_export_format(self):
+        ray_exporter = RayExporter(osp.join(self.tmp_dir, 'outdata.jsonl'))
+        self.assertEqual(ray_exporter.export_format, 'jsonl')
+        self.assertEqual(ray_exporter._get_export_format('s3://bucket/outdata.parquet?versionId=1'), 'parquet')
+        self.assertEqual(ray_exporter._get_export_format('/path/outdata.JSON'), 'json')
+        self.assertEqual(ray_exporter._get_export_format('/path.with.dots/outdata'), 'jsonl')
+
+    @TEST_TAG('ray')
+    def test_s3_export_skips_creating_dir(self):
+
+        class FakeS3FileSystem:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+        with patch('data_juicer.utils.s3_utils.pyarrow.fs.S3FileSystem', FakeS3FileSystem):
+            ray_exporter = RayExporter('s3://bucket/outdata.jsonl', aws_region='us-east-1')
+            self.assertIsInstance(ray_exporter._base_export_extra_args['filesystem'], FakeS3FileSystem)
+            self.assertIs(ray_exporter._base_export_extra_args['try_create_dir'], False)
+
+            # the choice of the user is kept
+            ray_exporter = RayExporter('s3://bucket/outdata.jsonl', aws_region='us-east-1', try_create_dir=True)
+            self.assertIs(ray_exporter._base_export_extra_args['try_create_dir'], True)
+
+        # local exports keep the default of the writer
+        ray_exporter = RayExporter(osp.join(self.tmp_dir, 'outdata.jsonl'))
+        self.assertNotIn('try_create_dir', ray_exporter._base_export_extra_args)
+
     @TEST_TAG('ray')
     def test_json_not_keep_stats_and_hashes(self):
         import ray
@@ -79,6 +109,92 @@ class TestRayExporter(DataJuicerTestCaseBase):
 
         self.assertListOfDictEqual(data_list, self.data)
 
+    @unittest.skipIf(importlib.util.find_spec('orjson') is None, 'orjson is not installed')
+    @TEST_TAG('ray')
+    def test_jsonl_non_ascii_with_orjson(self):
+        import ray
+        from data_juicer.core.data.ray_dataset import RayDataset
+
+        data = [{'text': '你好', 'score': 0.1 + 0.2}, {'text': 'wörld', 'score': 1.0}]
+        dataset = RayDataset(ray.data.from_items(data))
+        out_path = osp.join(self.tmp_dir, 'outdata.jsonl')
+        ray_exporter = RayExporter(out_path)
+        ray_exporter.export(dataset.data)
+
+        content = ''
+        for fname in sorted(os.listdir(out_path)):
+            with open(osp.join(out_path, fname), encoding='utf-8') as f:
+                content += f.read()
+        # non-ASCII text is kept as is, and floats are not rounded as the
+        # pandas-based writer does
+        self.assertIn('你好', content)
+        self.assertIn('0.30000000000000004', content)
+
+        ds = ray.data.read_json(out_path)
+        data_list = ds.take_all()
+
+        self.assertListOfDictEqual(data_list, data)
+
+    @TEST_TAG('ray')
+    def test_jsonl_bytes(self):
+        import ray
+        from data_juicer.core.data.ray_dataset import RayDataset
+
+        # orjson can't serialize bytes, so these blocks fall back to the
+        # pandas-based writer
+        data = [{'text': '你好', 'bytes': b'hello'}, {'text': 'wörld', 'bytes': b'world'}]
+        dataset = RayDataset(ray.data.from_items(data))
+        out_path = osp.join(self.tmp_dir, 'outdata.jsonl')
+        ray_exporter = RayExporter(out_path)
+        ray_exporter.export(dataset.data)
+
+        content = ''
+        for fname in sorted(os.listdir(out_path)):
+            with open(osp.join(out_path, fname), encoding='utf-8') as f:
+                content += f.read()
+        self.assertIn('你好', content)
+
+        ds = ray.data.read_json(out_path)
+        data_list = ds.take_all()
+
+        self.assertListOfDictEqual(data_list, [{'text': '你好', 'bytes': 'hello'}, {'text': 'wörld', 'bytes': 'world'}])
+
+    @TEST_TAG('ray')
+    def test_jsonl_with_shard_size(self):
+        import ray
+
+        out_path = osp.join(self.tmp_dir, 'outdata.jsonl')
+        ray_exporter = RayExporter(
+            out_path,
+            export_shard_size=1024,
+            keep_stats_in_res_ds=True,
+            keep_hashes_in_res_ds=True)
+        ray_exporter.export(self.dataset.data)
+
+        ds = ray.data.read_json(out_path)
+        data_list = ds.take_all()
+
+        self.assertListOfDictEqual(data_list, self.data)
+        # exporting should not leak per-call args into the exporter
+        self.assertNotIn('min_rows_per_file', ray_exporter.export_extra_args)
+
+    @TEST_TAG('ray')
+    def test_jsonl_repartition_materialized_dataset(self):
+        import ray
+
+        dataset = ray.data.range(100).repartition(1).materialize()
+        out_path = osp.join(self.tmp_dir, 'outdata.jsonl')
+        ray_exporter = RayExporter(out_path)
+        with patch('ray.cluster_resources', return_value={'CPU': 4}):
+            ray_exporter.export(dataset)
+
+        # a single-block materialized dataset is split across the CPUs before
+        # writing, and each block is written to its own file
+        self.assertEqual(len(os.listdir(out_path)), 4)
+
+        ds = ray.data.read_json(out_path)
+        self.assertListEqual(sorted(row['id'] for row in ds.take_all()), list(range(100)))
+
     @TEST_TAG('ray')
     def test_parquet_keep_stats(self):
         import ray
@@ -95,6 +211,27 @@ class TestRayExporter(DataJuicerTestCaseBase):
 
         self.assertListEqual(data_list, self._pop_raw_data_keys([HashKeys.hash]))
 
+    @TEST_TAG('ray')
+    def test_parquet_with_shard_size_row_groups(self):
+        import glob
+
+        import pyarrow.parquet as pq
+        import ray
+
+        dataset = ray.data.range(200_000).materialize()
+        out_path = osp.join(self.tmp_dir, 'outdata.parquet')
+        ray_exporter = RayExporter(out_path, export_shard_size=1024 * 1024)
+        ray_exporter.export(dataset)
+
+        row_groups = []
+        for f in sorted(glob.glob(osp.join(out_path, '*.parquet'))):
+            metadata = pq.ParquetFile(f).metadata
+            row_groups.append([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)])
+
+        # each shard is written as a single row group when no row_group_size
+        # is given
+        self.assertListEqual(row_groups, [[100_000], [100_000]])
+
     @TEST_TAG('ray')
     def test_lance_keep_hashes(self):
         import ray
@@ -111,6 +248,25 @@ class TestRayExporter(DataJuicerTestCaseBase):
 
         self.assertListOfDictEqual(data_list, self._pop_raw_data_keys([Fields.stats]))
 
+    @TEST_TAG('ray')
+    def test_iceberg_fallback_to_file(self):
+        import ray
+
+        out_path = osp.join(self.tmp_dir, 'outdata.jsonl')
+        ray_exporter = RayExporter(
+            out_path,
+            export_type='iceberg',
+            keep_stats_in_res_ds=False,
+            keep_hashes_in_res_ds=False,
+            table_identifier='non_existent_db.non_existent_table',
+            catalog_kwargs={'name': 'non_existent_catalog'})
+        ray_exporter.export(self.dataset.data)
+
+        ds = ray.data.read_json(out_path)
+        data_list = ds.take_all()
+
+        self.assertListOfDictEqual(data_list, self._pop_raw_data_keys([Fields.stats, HashKeys.hash]))
+
     @TEST_TAG('ray')
     def test_webdataset_multi_images(self):
         import io
@@ -162,6 +318,49 @@ class TestRayExporter(DataJuicerTestCaseBase):
                 [Image.open(io.BytesIO(v)) for v in data[i]['jpgs']]
             )
 
+    @TEST_TAG('ray')
+    def test_webdataset_field_mapping(self):
+        import io
+        from PIL import Image
+        import ray
+        from data_juicer.core.data.ray_dataset import RayDataset
+
+        data_dir = osp.abspath(osp.join(osp.dirname(osp.realpath(__file__)), '..', 'ops', 'data'))
+        img1_path = osp.join(data_dir, 'img1.png')
+        img2_path = osp.join(data_dir, 'img2.jpg')
+
+        data = [
+            {
+                'text': 'hello',
+                'images': [img1_path, img2_path],
+                'image_bytes': load_images_byte([img1_path, img2_path])},
+            {
+                'text': 'world',
+                'images': [img2_path, img1_path],
+                'image_bytes': load_images_byte([img2_path, img1_path])},
+        ]
+        dataset = RayDataset(ray.data.from_items(data))
+        out_path = osp.join(self.tmp_dir, 'outdata.webdataset')
+        ray_exporter = RayExporter(
+            out_path,
+            export_type='webdataset',
+            field_mapping={'json': ['text', 'images'], 'jpgs': 'image_bytes'})
+        ray_exporter.export(dataset.data)
+
+        ds = RayDataset.read_webdataset(out_path)
+        res_list = ds.take_all()
+
+        self.assertEqual(len(res_list), len(data))
+        res_list.sort(key=lambda x: x['json']['text'])
+        data.sort(key=lambda x: x['text'])
+
+        for i in range(len(data)):
+            self.assertDictEqual(res_list[i]['json'], {'text': data[i]['text'], 'images': data[i]['images']})
+            self.assertEqual(
+                res_list[i]['jpgs'],
+                [Image.open(io.BytesIO(v)) for v in data[i]['image_bytes']]
+            )
+
     @TEST_TAG('ray')
     def test_webdataset_multi_videos_frames_bytes(self):
         import io
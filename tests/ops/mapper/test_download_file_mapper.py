@@ -1,7 +1,6 @@
 import unittest
 import os
 import os.path as osp
-import shutil
 import tempfile
 import threading
 import numpy as np
@@ -16,14 +15,35 @@ from data_juicer.ops.mapper.download_file_mapper import DownloadFileMapper
 
 class DownloadFileMapperTest(DataJuicerTestCaseBase):
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.data_path = osp.abspath(osp.join(osp.dirname(osp.realpath(__file__)), '..', 'data'))
+        cls.img1_path = osp.join(cls.data_path, 'img1.png')
+        cls.img2_path = osp.join(cls.data_path, 'img2.jpg')
+        cls.img3_path = osp.join(cls.data_path, 'img3.jpg')
+
+        # read and decode the source images only once for all tests
+        cls.img_bytes = {
+            path: load_image_byte(path)
+            for path in [cls.img1_path, cls.img2_path, cls.img3_path]
+        }
+        cls._decoded_images = {}
+
+    def _load_target_image(self, fname):
+        if fname not in self._decoded_images:
+            self._decoded_images[fname] = np.array(load_image(os.path.join(self.data_path, fname)))
+        return self._decoded_images[fname]
+
     def setUp(self):
         super().setUp()
 
-        self.temp_dir = tempfile.mkdtemp()
-        self.data_path = osp.abspath(osp.join(osp.dirname(osp.realpath(__file__)), '..', 'data'))
-        self.img1_path = osp.join(self.data_path, 'img1.png')
-        self.img2_path = osp.join(self.data_path, 'img2.jpg')
-        self.img3_path = osp.join(self.data_path, 'img3.jpg')
+        # DJ_TEST_TMPDIR can point to a tmpfs such as /dev/shm to keep the
+        # downloaded files off the disk
+        self._tmp = tempfile.TemporaryDirectory(dir=os.environ.get('DJ_TEST_TMPDIR', None))
+        self.temp_dir = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
 
         # start HTTP server
         self.server_address = ('localhost', 0)  # 0 means random port
@@ -40,13 +60,8 @@ class DownloadFileMapperTest(DataJuicerTestCaseBase):
         self.server_thread = threading.Thread(target=self.httpd.serve_forever)
         self.server_thread.daemon = True
         self.server_thread.start()
-
-    def tearDown(self):
-        self.httpd.shutdown()
-        self.httpd.server_close()
-        shutil.rmtree(self.temp_dir)
-
-        super().tearDown()
+        self.addCleanup(self.httpd.server_close)
+        self.addCleanup(self.httpd.shutdown)
 
     def _test_image_download(self, ds_list, save_field=None):
         op = DownloadFileMapper(
@@ -73,7 +88,7 @@ class DownloadFileMapperTest(DataJuicerTestCaseBase):
                 else:
                     self.assertEqual(s_path, r_path)
 
-                t_img = np.array(load_image(os.path.join(self.data_path, fname)))
+                t_img = self._load_target_image(fname)
                 r_img = np.array(load_image(r_path))
 
                 np.testing.assert_array_equal(t_img, r_img)
@@ -81,7 +96,7 @@ class DownloadFileMapperTest(DataJuicerTestCaseBase):
                 if save_field:
                     self.assertEqual(
                         res[save_field][j],
-                        load_image_byte(os.path.join(self.data_path, fname))
+                        self.img_bytes[os.path.join(self.data_path, fname)]
                     )
 
     def test_image_download(self):
@@ -180,7 +195,7 @@ class DownloadFileMapperTest(DataJuicerTestCaseBase):
             else:
                 self.assertEqual(s_path, r_path)
 
-            t_img = np.array(load_image(os.path.join(self.data_path, fname)))
+            t_img = self._load_target_image(fname)
             r_img = np.array(load_image(r_path))
 
             np.testing.assert_array_equal(t_img, r_img)
@@ -224,7 +239,7 @@ class DownloadFileMapperTest(DataJuicerTestCaseBase):
                 fname = os.path.basename(s_path)
                 self.assertEqual(
                     res[save_field][j],
-                    load_image_byte(os.path.join(self.data_path, fname))
+                    self.img_bytes[os.path.join(self.data_path, fname)]
                 )
 
     def test_image_with_savefield_and_savedir(self):
@@ -266,22 +281,22 @@ class DownloadFileMapperTest(DataJuicerTestCaseBase):
         tgt_list = [{
             'images': [self.img1_url],
             'id': 1,
-            save_field: [load_image_byte(self.img1_path)]
+            save_field: [self.img_bytes[self.img1_path]]
         }, {
             'images': [self.img2_url, self.img3_url],
             'id': 2,
-            save_field: [b'loaded', load_image_byte(self.img3_path)],
+            save_field: [b'loaded', self.img_bytes[self.img3_path]],
         }, {
             'images': [self.img1_url, self.img2_path, self.img3_url],
             'id': 3,
             save_field: [
-                load_image_byte(self.img1_path),
-                load_image_byte(self.img2_path),
-                load_image_byte(self.img3_path)]
+                self.img_bytes[self.img1_path],
+                self.img_bytes[self.img2_path],
+                self.img_bytes[self.img3_path]]
         }, {
             'images': [self.img2_url],
             'id': 4,
-            save_field: [load_image_byte(self.img2_path)]
+            save_field: [self.img_bytes[self.img2_path]]
         }]
 
         op = DownloadFileMapper(
@@ -329,11 +344,11 @@ class DownloadFileMapperTest(DataJuicerTestCaseBase):
         tgt_list = [{
             'images': [_to_tmp_path(self.img1_url)],
             'id': 1,
-            'image_bytes': [load_image_byte(self.img1_path)]
+            'image_bytes': [self.img_bytes[self.img1_path]]
         }, {
             'images': [_to_tmp_path(self.img2_url), _to_tmp_path(self.img3_url)],
             'id': 2,
-            'image_bytes': [b'loaded', load_image_byte(self.img3_path)],
+            'image_bytes': [b'loaded', self.img_bytes[self.img3_path]],
         }, {
             'images': [
                 _to_tmp_path(self.img1_url),
@@ -341,13 +356,13 @@ class DownloadFileMapperTest(DataJuicerTestCaseBase):
                 _to_tmp_path(self.img3_url)],
             'id': 3,
             'image_bytes': [
-                load_image_byte(self.img1_path),
-                load_image_byte(self.img2_path),
-                load_image_byte(self.img3_path)]
+                self.img_bytes[self.img1_path],
+                self.img_bytes[self.img2_path],
+                self.img_bytes[self.img3_path]]
         }, {
             'images': [_to_tmp_path(self.img2_url)],
             'id': 4,
-            'image_bytes': [load_image_byte(self.img2_path)]
+            'image_bytes': [self.img_bytes[self.img2_path]]
         }]
 
         op = DownloadFileMapper(
@@ -17,35 +17,13 @@ class TestS3Utils(DataJuicerTestCaseBase):
     """Test cases for S3 utility functions"""
 
     def setUp(self):
-        """Save original environment variables before each test"""
+        """Snapshot the environment variables before each test"""
         super().setUp()
-        self.original_env = {
-            "AWS_ACCESS_KEY_ID": os.environ.get("AWS_ACCESS_KEY_ID"),
-            "AWS_SECRET_ACCESS_KEY": os.environ.get("AWS_SECRET_ACCESS_KEY"),
-            "AWS_SESSION_TOKEN": os.environ.get("AWS_SESSION_TOKEN"),
-            "AWS_REGION": os.environ.get("AWS_REGION"),
-            "AWS_DEFAULT_REGION": os.environ.get("AWS_DEFAULT_REGION"),
-        }
-
-    def tearDown(self):
-        """Restore original environment variables after each test"""
-        # Clear all AWS-related env vars first
-        for key in [
-            "AWS_ACCESS_KEY_ID",
-            "AWS_SECRET_ACCESS_KEY",
-            "AWS_SESSION_TOKEN",
-            "AWS_REGION",
-            "AWS_DEFAULT_REGION",
-        ]:
-            if key in os.environ:
-                del os.environ[key]
-
-        # Restore original values
-        for key, value in self.original_env.items():
-            if value is not None:
-                os.environ[key] = value
-
-        super().tearDown()
+        # tests set AWS_* variables freely; patch.dict restores the whole
+        # environment afterwards, even if a test fails halfway
+        self.env_patcher = patch.dict(os.environ)
+        self.env_patcher.start()
+        self.addCleanup(self.env_patcher.stop)
 
     def test_get_aws_credentials_from_env_only(self):
         """Test getting credentials from environment variables only"""